@@ -1,34 +1,14 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-import os
-
-# --- File paths (use the files you uploaded) ---
-USERS_CSV = "Users.csv"
-MEMBERS_CSV = "Members.csv"
-CARS_CSV = "Cars.csv"
-CARS_BOOKED_CSV = "Cars Booked.csv"
-RETURNED_CARS_CSV = "Returned Cars.csv"
-
-# --- Expected headers (match your uploaded CSVs) ---
-USERS_COLS = ["User ID", "User Name", "Password"]
-MEMBERS_COLS = ["MID", "M Name", "Phone No.", "No. of cars Booked"]
-CARS_COLS = ["Car No.", "Car Name", "Brand", "Branch", "Fuel Type", "Cost", "Category"]
-CARS_BOOKED_COLS = ["Car Name", "M Name", "Date of Booking", "No. of Days", "Total Cost", "Return Status"]
-RETURNED_COLS = ["Car Name", "M Name", "Date of Booking", "No. of Days", "Total Cost", "Return Date"]
-
-def ensure_csv(path, cols):
-    """Create CSV with header if file missing or empty."""
-    if not os.path.exists(path):
-        df = pd.DataFrame(columns=cols)
-        df.to_csv(path, index=False)
-    else:
-        try:
-            df = pd.read_csv(path)
-            # If file exists but has no columns / empty, re-create header
-            if df.shape[1] == 0:
-                pd.DataFrame(columns=cols).to_csv(path, index=False)
-        except pd.errors.EmptyDataError:
-            pd.DataFrame(columns=cols).to_csv(path, index=False)
+
+from rental_data import (
+    USERS_CSV, MEMBERS_CSV, CARS_CSV, CARS_BOOKED_CSV, RETURNED_CARS_CSV,
+    USERS_COLS, MEMBERS_COLS, CARS_COLS, CARS_BOOKED_COLS, RETURNED_COLS,
+    ensure_csv, read_csv_safe, save_df_safe,
+    ensure_layout, car_exists, index_car, unindex_car,
+    cars_path_for, cars_path_for_branch, bookings_path_for, read_cars, read_bookings,
+)
+from pricing import MAX_RENTAL_DAYS, parse_date, price_cars
+from export_catalogue import CATALOGUE_DIR, export_catalogue, read_catalogue_index
 
 # Ensure all required CSV files exist
 ensure_csv(USERS_CSV, USERS_COLS)
@@ -36,31 +16,11 @@ ensure_csv(MEMBERS_CSV, MEMBERS_COLS)
 ensure_csv(CARS_CSV, CARS_COLS)
 ensure_csv(CARS_BOOKED_CSV, CARS_BOOKED_COLS)
 ensure_csv(RETURNED_CARS_CSV, RETURNED_COLS)
+# Split cars/bookings per branch (or merge them back) to match SHARD_BY_BRANCH
+ensure_layout()
 
 print("---------------------------WELCOME TO LUXURY CAR RENTALS---------------------------")
 
-# ----------------------------- Utility helpers -----------------------------
-def read_csv_safe(path, expected_cols):
-    """Read CSV and ensure expected columns exist (return DataFrame)."""
-    df = pd.read_csv(path)
-    # Add missing expected columns (keep existing columns and order expected where possible)
-    for c in expected_cols:
-        if c not in df.columns:
-            df[c] = ""
-    # Reorder to expected cols + extra columns (preserve expected order)
-    cols = [c for c in expected_cols if c in df.columns] + [c for c in df.columns if c not in expected_cols]
-    return df[cols]
-
-def save_df_safe(df, path, expected_cols=None):
-    """Save dataframe to csv. If expected_cols provided, ensure those columns exist and are first."""
-    if expected_cols:
-        for c in expected_cols:
-            if c not in df.columns:
-                df[c] = ""
-        cols = [c for c in expected_cols if c in df.columns] + [c for c in df.columns if c not in expected_cols]
-        df = df[cols]
-    df.to_csv(path, index=False)
-
 # ----------------------------- User functions -----------------------------
 def addUser():
     uid = input("Enter User ID: ").strip()
@@ -102,17 +62,23 @@ def addNewCar():
         return
     category = input("Enter category of the car: ").strip()
 
-    cdf = read_csv_safe(CARS_CSV, CARS_COLS)
-    if (cdf["Car No."] == carno).any() or (cdf["Car Name"] == carname).any():
+    if car_exists(carno, carname):
         print("A car with the same number or name already exists.")
         return
+    path = cars_path_for_branch(branch)
+    cdf = read_csv_safe(path, CARS_COLS)
     cdf.loc[len(cdf)] = [carno, carname, brand, branch, fueltype, cost, category]
-    save_df_safe(cdf, CARS_CSV, CARS_COLS)
+    save_df_safe(cdf, path, CARS_COLS)
+    index_car(carno, carname, branch)
     print("Car added successfully!")
 
 def searchCar():
     carname = input("Enter a Car name: ").strip()
-    cdf = read_csv_safe(CARS_CSV, CARS_COLS)
+    path = cars_path_for(carname)
+    if path is None:
+        print("No cars found with the given name")
+        return
+    cdf = read_csv_safe(path, CARS_COLS)
     df = cdf.loc[cdf["Car Name"].astype(str) == carname]
     if df.empty:
         print("No cars found with the given name")
@@ -126,14 +92,19 @@ def deleteCar():
     except ValueError:
         print("Car Number must be an integer.")
         return
-    cdf = read_csv_safe(CARS_CSV, CARS_COLS)
+    path = cars_path_for(carno=carno)
+    if path is None:
+        print("No car found with the given number")
+        return
+    cdf = read_csv_safe(path, CARS_COLS)
     cdf = cdf[cdf["Car No."] != carno]
-    save_df_safe(cdf, CARS_CSV, CARS_COLS)
+    save_df_safe(cdf, path, CARS_COLS)
+    unindex_car(carno)
     print("Car Deleted Successfully")
     print(cdf)
 
 def showCars():
-    print(read_csv_safe(CARS_CSV, CARS_COLS))
+    print(read_cars())
 
 # ----------------------------- Members -----------------------------
 def addNewMember():
@@ -185,7 +156,11 @@ def showMembers():
 # ----------------------------- Booking -----------------------------
 def bookCar():
     carname = input("Enter car name: ").strip()
-    cdf = read_csv_safe(CARS_CSV, CARS_COLS)
+    path = cars_path_for(carname)
+    if path is None:
+        print("No Car found in the records")
+        return
+    cdf = read_csv_safe(path, CARS_COLS)
     car = cdf.loc[cdf["Car Name"].astype(str) == carname]
     if car.empty:
         print("No Car found in the records")
@@ -199,15 +174,24 @@ def bookCar():
         return
 
     dateofbooking = input("Enter date of booking (e.g. 2025-11-19): ").strip()
+    try:
+        startdate = parse_date(dateofbooking)
+    except ValueError:
+        print("Date of booking must be in YYYY-MM-DD format.")
+        return
     try:
         numberofdays = int(input("Enter the number of days booked: ").strip())
     except ValueError:
         print("Number of days must be an integer.")
         return
+    if not 1 <= numberofdays <= MAX_RENTAL_DAYS:
+        print(f"Number of days must be between 1 and {MAX_RENTAL_DAYS}.")
+        return
 
-    # get cost as scalar
-    cost_val = int(car.iloc[0]["Cost"])
-    total_cost = numberofdays * cost_val
+    # weekend/seasonal rates and long-rental discount come from the pricing engine
+    quote = price_cars(car.head(1), startdate, numberofdays).iloc[0]
+    cost_val = int(quote["Cost"])
+    total_cost = quote["Total Cost"]
 
     print("^" * 40)
     print("      BILL GENERATED   ")
@@ -215,12 +199,16 @@ def bookCar():
     print("Car Rented:", carname)
     print("Name of Member:", mname)
     print("Cost per Day:", cost_val)
+    print("Rental Cost (weekend/seasonal rates):", quote["Rental Cost"])
+    if quote["Discount"]:
+        print("Long Rental Discount:", quote["Discount"])
     print("Total Rental Cost:", total_cost)
     print("^" * 40)
 
-    bdf = read_csv_safe(CARS_BOOKED_CSV, CARS_BOOKED_COLS)
+    bookings_path = bookings_path_for(carname)
+    bdf = read_csv_safe(bookings_path, CARS_BOOKED_COLS)
     bdf.loc[len(bdf)] = [carname, mname, dateofbooking, numberofdays, total_cost, ""]
-    save_df_safe(bdf, CARS_BOOKED_CSV, CARS_BOOKED_COLS)
+    save_df_safe(bdf, bookings_path, CARS_BOOKED_COLS)
 
     # update member's "No. of cars Booked"
     idx = mdf[mdf["M Name"].astype(str) == mname].index
@@ -233,12 +221,16 @@ def bookCar():
         save_df_safe(mdf, MEMBERS_CSV, MEMBERS_COLS)
 
     print("Car booked successfully")
-    print(read_csv_safe(CARS_BOOKED_CSV, CARS_BOOKED_COLS))
+    print(bdf)
 
 def returnCar():
     mname = input("Enter member name: ").strip()
     carname = input("Enter car name: ").strip()
-    rdf = read_csv_safe(CARS_BOOKED_CSV, CARS_BOOKED_COLS)
+    bookings_path = bookings_path_for(carname)
+    if bookings_path is None:
+        print("No such booking found")
+        return
+    rdf = read_csv_safe(bookings_path, CARS_BOOKED_COLS)
 
     mask = (rdf["Car Name"].astype(str) == carname) & (rdf["M Name"].astype(str) == mname)
     matched = rdf[mask]
@@ -270,7 +262,7 @@ def returnCar():
 
     # Remove the bookings from Cars Booked CSV
     rdf = rdf[~mask]
-    save_df_safe(rdf, CARS_BOOKED_CSV, CARS_BOOKED_COLS)
+    save_df_safe(rdf, bookings_path, CARS_BOOKED_COLS)
 
     # decrement member's No. of cars Booked
     mdf = read_csv_safe(MEMBERS_CSV, MEMBERS_COLS)
@@ -288,7 +280,7 @@ def returnCar():
 
 # ----------------------------- Show / Delete Booked -----------------------------
 def showbookedCars():
-    rdf = read_csv_safe(CARS_BOOKED_CSV, CARS_BOOKED_COLS)
+    rdf = read_bookings()
     if rdf.empty:
         print("No active bookings.")
         return
@@ -301,10 +293,14 @@ def showbookedCars():
 
 def deletebookedCars():
     carname = input("Enter a car name: ").strip()
-    bdf = read_csv_safe(CARS_BOOKED_CSV, CARS_BOOKED_COLS)
+    bookings_path = bookings_path_for(carname)
+    if bookings_path is None:
+        print(f"Deleted 0 booked entries for car '{carname}'")
+        return
+    bdf = read_csv_safe(bookings_path, CARS_BOOKED_COLS)
     before = len(bdf)
     bdf = bdf[bdf["Car Name"].astype(str) != carname]
-    save_df_safe(bdf, CARS_BOOKED_CSV, CARS_BOOKED_COLS)
+    save_df_safe(bdf, bookings_path, CARS_BOOKED_COLS)
     print(f"Deleted {before - len(bdf)} booked entries for car '{carname}'")
     print(bdf)
 
@@ -314,7 +310,7 @@ def showCharts():
     print("Press 2 - Number of Cars booked by members")
     ch = input("Enter your choice: ").strip()
     if ch == "1":
-        df = read_csv_safe(CARS_CSV, CARS_COLS)
+        df = read_cars()
         if df.empty:
             print("No car data to plot.")
             return
@@ -323,7 +319,7 @@ def showCharts():
         plt.ylabel("Cost per day")
         plt.show()
     elif ch == "2":
-        df = read_csv_safe(CARS_BOOKED_CSV, CARS_BOOKED_COLS)
+        df = read_bookings()
         if df.empty:
             print("No booking data to plot.")
             return
@@ -335,6 +331,14 @@ def showCharts():
     else:
         print("Invalid choice for charts.")
 
+# ----------------------------- Web catalogue -----------------------------
+def exportCatalogue():
+    written = export_catalogue()
+    total = len(read_catalogue_index()["pages"])
+    print(f"Catalogue exported to {CATALOGUE_DIR}/: {len(written)} of {total} pages regenerated")
+    for name in written:
+        print("  updated", name)
+
 # ----------------------------- Login & Menu -----------------------------
 def login():
     uid = input("Enter User ID: ").strip().lower()
@@ -381,7 +385,8 @@ def showMenu():
     print("13 - Show all Booked Cars")
     print("14 - Delete a Booked Car")
     print("15 - View Charts")
-    print("16 - Exit")
+    print("16 - Export Web Catalogue")
+    print("17 - Exit")
     try:
         return int(input("Enter your choice: ").strip())
     except ValueError:
@@ -422,6 +427,8 @@ if login():
         elif ch == 15:
             showCharts()
         elif ch == 16:
+            exportCatalogue()
+        elif ch == 17:
             break
         else:
             print("Invalid Option Selected")
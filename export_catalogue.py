@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from rental_data import read_cars
+
+# --- Static catalogue for the web frontend ---
+# Cars are grouped into fixed price bands so a new or repriced car only changes
+# the pages of its own band. Page files are named after their content hash, so
+# an unchanged page keeps its URL (cache it forever); only index.json changes
+# between exports. Each page also gets a precompressed .json.gz copy.
+# PAGE_SIZE caps a page; sparse bands give smaller pages, and the frontends
+# fetch pages on demand until they have about PAGE_SIZE cars to show.
+CATALOGUE_DIR = "catalogue"
+CATALOGUE_INDEX = os.path.join(CATALOGUE_DIR, "index.json")
+PAGE_SIZE = 12
+PRICE_BAND = 100
+CATALOGUE_FIELDS = {
+    "Car No.": "number",
+    "Car Name": "name",
+    "Brand": "brand",
+    "Branch": "branch",
+    "Fuel Type": "fuel",
+    "Category": "category",
+    "Cost": "price",
+}
+
+def page_file(band_low, digest):
+    return f"cars-{band_low}-{digest[:16]}.json"
+
+def read_catalogue_index():
+    """Manifest from the last export, or an empty one if there was none."""
+    try:
+        with open(CATALOGUE_INDEX, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"pages": []}
+
+def write_atomic(path, data):
+    """Write bytes to a temp file and move it into place, so readers never see a partial file."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def write_page(path, data):
+    """Write a page and its precompressed copy."""
+    write_atomic(path, data)
+    # mtime=0 keeps the .gz byte-identical for identical pages
+    write_atomic(path + ".gz", gzip.compress(data, mtime=0))
+
+def export_catalogue():
+    """Export the fleet as price-banded JSON pages, writing only pages whose cars changed.
+
+    Returns the list of page files that were written.
+    """
+    os.makedirs(CATALOGUE_DIR, exist_ok=True)
+    cars = read_cars()
+    # A car without a usable daily cost cannot be priced or banded; leave it out
+    cost = pd.to_numeric(cars["Cost"], errors="coerce")
+    skipped = cars.loc[cost.isna(), "Car Name"].astype(str).tolist()
+    if skipped:
+        print(f"Skipped {len(skipped)} car(s) with a missing or invalid cost:", ", ".join(skipped))
+    cost = cost[cost.notna()]
+    if (cost % 1 == 0).all():
+        cost = cost.astype(int)
+    cars = cars.loc[cost.index].assign(Cost=cost)
+    cars = cars.sort_values(["Cost", "Car Name"], ignore_index=True)
+    bands = (cars["Cost"] // PRICE_BAND * PRICE_BAND).astype(int)
+    cars = cars[list(CATALOGUE_FIELDS)].rename(columns=CATALOGUE_FIELDS)
+
+    pages = []
+    written = []
+    for band_low, band in cars.groupby(bands, sort=True):
+        records = json.loads(band.to_json(orient="records"))
+        for start in range(0, len(records), PAGE_SIZE):
+            page = records[start:start + PAGE_SIZE]
+            data = json.dumps(page, separators=(",", ":")).encode("utf-8")
+            name = page_file(band_low, hashlib.sha256(data).hexdigest())
+            path = os.path.join(CATALOGUE_DIR, name)
+            if not os.path.exists(path) or not os.path.exists(path + ".gz"):
+                write_page(path, data)
+                written.append(name)
+            pages.append({"file": name, "band": [int(band_low), int(band_low) + PRICE_BAND], "count": len(page)})
+
+    index = {"page_size": PAGE_SIZE, "total_cars": len(cars), "sort": "price", "pages": pages}
+    write_atomic(CATALOGUE_INDEX, json.dumps(index, indent=2).encode("utf-8"))
+
+    # Remove pages no longer listed (after index.json stops pointing at them)
+    current = {p["file"] for p in pages}
+    for name in os.listdir(CATALOGUE_DIR):
+        if name != "index.json" and name.removesuffix(".gz") not in current:
+            os.remove(os.path.join(CATALOGUE_DIR, name))
+    return written
+
+if __name__ == "__main__":
+    written = export_catalogue()
+    print(f"Catalogue exported to {CATALOGUE_DIR}/: {len(written)} pages regenerated")
@@ -0,0 +1,158 @@
+import json
+import threading
+from collections import OrderedDict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+from rental_data import read_cars, cars_version, branch_key
+
+# --- Rate tables (edit these to change pricing) ---
+# Multiplier applied to the daily cost, Monday = 0 ... Sunday = 6
+WEEKDAY_RATES = {5: 1.2, 6: 1.2}
+# Multiplier applied to the daily cost for days in peak months
+SEASON_RATES = {6: 1.1, 7: 1.15, 8: 1.15, 12: 1.25}
+# (minimum days, discount) - the largest matching discount applies to the whole rental
+LONG_RENTAL_DISCOUNTS = [(7, 0.10), (14, 0.15), (30, 0.25)]
+
+# Longest rental that can be quoted or booked
+MAX_RENTAL_DAYS = 365
+# Number of (date range, filter) results kept in the quote cache
+QUOTE_CACHE_SIZE = 256
+
+QUOTE_API_PORT = 8000
+
+# Rate tables compiled once into numpy lookup arrays
+_WEEKDAY_TABLE = np.array([WEEKDAY_RATES.get(d, 1.0) for d in range(7)])
+_MONTH_TABLE = np.array([1.0] + [SEASON_RATES.get(m, 1.0) for m in range(1, 13)])
+_DISCOUNT_DAYS = np.array([0] + [d for d, _ in sorted(LONG_RENTAL_DISCOUNTS)])
+_DISCOUNT_RATES = np.array([0.0] + [r for _, r in sorted(LONG_RENTAL_DISCOUNTS)])
+
+# (start, days, branch, category, fuel type) -> quotes, least recently used first.
+# Every entry is for _quote_cache_version; the cache is emptied when the cars change.
+_quote_cache = OrderedDict()
+_quote_cache_version = None
+_quote_cache_lock = threading.Lock()
+
+def parse_date(text):
+    """Parse a YYYY-MM-DD date (raises ValueError)."""
+    return date.fromisoformat(str(text).strip())
+
+def rate_factor(start, days):
+    """Sum of the weekend/seasonal multipliers over each day of the rental."""
+    dates = np.arange(np.datetime64(start, "D"), np.datetime64(start, "D") + days)
+    # 1970-01-01 was a Thursday, so shift by 3 to get Monday = 0
+    weekdays = (dates.astype(np.int64) + 3) % 7
+    months = dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    return float((_WEEKDAY_TABLE[weekdays] * _MONTH_TABLE[months]).sum())
+
+def long_rental_discount(days):
+    """Discount fraction for a rental of the given length."""
+    return float(_DISCOUNT_RATES[np.searchsorted(_DISCOUNT_DAYS, days, side="right") - 1])
+
+def price_cars(cars, start, days):
+    """Quote every car in the DataFrame for the date range in one vectorised pass.
+
+    Returns a copy of cars with "Days", "Rental Cost", "Discount" and "Total Cost" added.
+    """
+    if not 1 <= days <= MAX_RENTAL_DAYS:
+        raise ValueError(f"Number of days must be between 1 and {MAX_RENTAL_DAYS}.")
+    costs = cars["Cost"].astype(float).to_numpy()
+    discount = long_rental_discount(days)
+    rental = costs * rate_factor(start, days)
+    quotes = cars.copy()
+    quotes["Days"] = days
+    # Round the printed parts first so Rental Cost - Discount always equals the total
+    quotes["Rental Cost"] = rental.round(2)
+    quotes["Discount"] = (quotes["Rental Cost"] * discount).round(2)
+    quotes["Total Cost"] = (quotes["Rental Cost"] - quotes["Discount"]).round(2)
+    return quotes
+
+def normalise_filter(value):
+    """Filter value as used for matching and cache keys ("" and None mean no filter)."""
+    if value is None:
+        return None
+    return str(value).strip().lower() or None
+
+def quote_fleet(start, days, branch=None, category=None, fuel_type=None):
+    """Quotes for every car matching the filters, cheapest first (cached until the cars change)."""
+    global _quote_cache_version
+    branch, category, fuel_type = (normalise_filter(v) for v in (branch, category, fuel_type))
+    key = (start, days, branch, category, fuel_type)
+    version = cars_version()
+    with _quote_cache_lock:
+        if version != _quote_cache_version:
+            _quote_cache.clear()
+            _quote_cache_version = version
+        if key in _quote_cache:
+            _quote_cache.move_to_end(key)
+            return _quote_cache[key].copy()
+
+    cars = read_cars()
+    mask = np.ones(len(cars), dtype=bool)
+    # Branch is matched on its shard name, so blank branches are "Unassigned"
+    columns = (
+        (cars["Branch"].map(branch_key), branch),
+        (cars["Category"].astype(str).str.strip(), category),
+        (cars["Fuel Type"].astype(str).str.strip(), fuel_type),
+    )
+    for col, value in columns:
+        if value:
+            mask &= (col.str.lower() == value).to_numpy()
+    quotes = price_cars(cars[mask], start, days).sort_values("Total Cost", ignore_index=True)
+    with _quote_cache_lock:
+        if version == _quote_cache_version:
+            _quote_cache[key] = quotes
+            if len(_quote_cache) > QUOTE_CACHE_SIZE:
+                _quote_cache.popitem(last=False)
+    return quotes.copy()
+
+# ----------------------------- Quote API -----------------------------
+class QuoteHandler(BaseHTTPRequestHandler):
+    """GET /api/quote?start=YYYY-MM-DD&end=YYYY-MM-DD[&car=..][&branch=..][&category=..][&fuel=..]"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/api/quote":
+            self._reply(404, {"error": "Not found"})
+            return
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            start = parse_date(params["start"])
+            # The booking form's end date is inclusive
+            days = (parse_date(params["end"]) - start).days + 1 if "end" in params else int(params["days"])
+            quotes = quote_fleet(start, days, params.get("branch"), params.get("category"), params.get("fuel"))
+        except (KeyError, ValueError) as e:
+            self._reply(400, {"error": f"Invalid quote request: {e}"})
+            return
+        if "car" in params:
+            quotes = quotes[quotes["Car Name"].astype(str) == params["car"]]
+            if quotes.empty:
+                self._reply(404, {"error": "No Car found in the records"})
+                return
+        self._reply(200, json.loads(quotes.to_json(orient="records")))
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        # The site is served separately (static host/CDN), so allow cross-origin reads
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def serve_quotes(port=QUOTE_API_PORT):
+    server = ThreadingHTTPServer(("", port), QuoteHandler)
+    print(f"Quote API listening on http://localhost:{port}/api/quote")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    serve_quotes()
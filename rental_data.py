@@ -0,0 +1,247 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# --- File paths (use the files you uploaded) ---
+USERS_CSV = "Users.csv"
+MEMBERS_CSV = "Members.csv"
+CARS_CSV = "Cars.csv"
+CARS_BOOKED_CSV = "Cars Booked.csv"
+RETURNED_CARS_CSV = "Returned Cars.csv"
+
+# --- Expected headers (match your uploaded CSVs) ---
+USERS_COLS = ["User ID", "User Name", "Password"]
+MEMBERS_COLS = ["MID", "M Name", "Phone No.", "No. of cars Booked"]
+CARS_COLS = ["Car No.", "Car Name", "Brand", "Branch", "Fuel Type", "Cost", "Category"]
+CARS_BOOKED_COLS = ["Car Name", "M Name", "Date of Booking", "No. of Days", "Total Cost", "Return Status"]
+RETURNED_COLS = ["Car Name", "M Name", "Date of Booking", "No. of Days", "Total Cost", "Return Date"]
+
+# --- Branch-sharded layout (optional) ---
+# When enabled, cars and active bookings are stored per branch under
+# Branches/<branch>/ and "Car Index.csv" routes each car name to its branch,
+# so a booking in one city only rewrites that city's files.
+# Turn it on here or with LCR_SHARD_BY_BRANCH=1. Data lives in one layout at a
+# time: switching on splits Cars.csv / Cars Booked.csv into shards (leaving the
+# global files empty), switching off merges the shards back and removes them.
+SHARD_BY_BRANCH = os.environ.get("LCR_SHARD_BY_BRANCH", "0") == "1"
+SHARDS_DIR = "Branches"
+CAR_INDEX_CSV = os.path.join(SHARDS_DIR, "Car Index.csv")
+CAR_INDEX_COLS = ["Car No.", "Car Name", "Branch"]
+UNASSIGNED_BRANCH = "Unassigned"
+
+def ensure_csv(path, cols):
+    """Create CSV with header if file missing or empty."""
+    if not os.path.exists(path):
+        df = pd.DataFrame(columns=cols)
+        df.to_csv(path, index=False)
+    else:
+        try:
+            df = pd.read_csv(path)
+            # If file exists but has no columns / empty, re-create header
+            if df.shape[1] == 0:
+                pd.DataFrame(columns=cols).to_csv(path, index=False)
+        except pd.errors.EmptyDataError:
+            pd.DataFrame(columns=cols).to_csv(path, index=False)
+
+def read_csv_safe(path, expected_cols):
+    """Read CSV and ensure expected columns exist (return DataFrame)."""
+    df = pd.read_csv(path)
+    # Add missing expected columns (keep existing columns and order expected where possible)
+    for c in expected_cols:
+        if c not in df.columns:
+            df[c] = ""
+    # Reorder to expected cols + extra columns (preserve expected order)
+    cols = [c for c in expected_cols if c in df.columns] + [c for c in df.columns if c not in expected_cols]
+    return df[cols]
+
+def save_df_safe(df, path, expected_cols=None):
+    """Save dataframe to csv. If expected_cols provided, ensure those columns exist and are first."""
+    if expected_cols:
+        for c in expected_cols:
+            if c not in df.columns:
+                df[c] = ""
+        cols = [c for c in expected_cols if c in df.columns] + [c for c in df.columns if c not in expected_cols]
+        df = df[cols]
+    df.to_csv(path, index=False)
+
+# ----------------------------- Branch shards -----------------------------
+def branch_key(branch):
+    """Shard name for a branch; blank branches share the Unassigned shard."""
+    if pd.isna(branch) or not str(branch).strip():
+        return UNASSIGNED_BRANCH
+    return str(branch).strip()
+
+def branch_dir(branch):
+    """Directory holding one branch's shard files."""
+    # Only letters, digits, spaces, '-' and '_' survive, so "..", "." and
+    # path separators cannot point outside the shards directory
+    name = "".join(ch if ch.isalnum() or ch in " -_" else "_" for ch in branch_key(branch))
+    path = os.path.join(SHARDS_DIR, name)
+    if os.path.dirname(os.path.abspath(path)) != os.path.abspath(SHARDS_DIR):
+        raise ValueError(f"Invalid branch name: {branch!r}")
+    return path
+
+def shard_path(branch, filename):
+    """Path of a shard file (e.g. CARS_CSV) for the given branch, creating the branch directory."""
+    d = branch_dir(branch)
+    os.makedirs(d, exist_ok=True)
+    return os.path.join(d, filename)
+
+def list_shard_paths(filename):
+    """Paths of an existing shard file across every branch."""
+    if not os.path.isdir(SHARDS_DIR):
+        return []
+    paths = []
+    for entry in sorted(os.listdir(SHARDS_DIR)):
+        p = os.path.join(SHARDS_DIR, entry, filename)
+        if os.path.isfile(p):
+            paths.append(p)
+    return paths
+
+def read_all_shards(filename, expected_cols):
+    """Read a shard file from every branch in parallel and merge into one DataFrame."""
+    paths = list_shard_paths(filename)
+    if not paths:
+        return pd.DataFrame(columns=expected_cols)
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+        frames = list(pool.map(lambda p: read_csv_safe(p, expected_cols), paths))
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=expected_cols)
+    return pd.concat(frames, ignore_index=True)
+
+def read_car_index():
+    return read_csv_safe(CAR_INDEX_CSV, CAR_INDEX_COLS)
+
+def lookup_branch(carname=None, carno=None):
+    """Branch the index routes a car (by name or number) to, or None if it is not indexed."""
+    idx = read_car_index()
+    if carname is not None:
+        row = idx.loc[idx["Car Name"].astype(str) == carname]
+    else:
+        row = idx.loc[idx["Car No."] == carno]
+    if row.empty:
+        return None
+    return row.iloc[0]["Branch"]
+
+def car_exists(carno, carname):
+    """True if the car number or name is already used anywhere in the fleet."""
+    df = read_car_index() if SHARD_BY_BRANCH else read_csv_safe(CARS_CSV, CARS_COLS)
+    return bool((df["Car No."] == carno).any() or (df["Car Name"].astype(str) == carname).any())
+
+def index_car(carno, carname, branch):
+    """Route a newly added car to its branch (no-op for the single-file layout)."""
+    if not SHARD_BY_BRANCH:
+        return
+    idx = read_car_index()
+    idx.loc[len(idx)] = [carno, carname, branch_key(branch)]
+    save_df_safe(idx, CAR_INDEX_CSV, CAR_INDEX_COLS)
+
+def unindex_car(carno):
+    """Drop a deleted car from the index (no-op for the single-file layout)."""
+    if not SHARD_BY_BRANCH:
+        return
+    idx = read_car_index()
+    save_df_safe(idx[idx["Car No."] != carno], CAR_INDEX_CSV, CAR_INDEX_COLS)
+
+def has_rows(path, cols):
+    return os.path.exists(path) and not read_csv_safe(path, cols).empty
+
+def ensure_layout():
+    """Move the cars and bookings data into the layout selected by SHARD_BY_BRANCH."""
+    if SHARD_BY_BRANCH and not os.path.exists(CAR_INDEX_CSV):
+        split_into_shards()
+        print("Cars and bookings split by branch into", SHARDS_DIR)
+    elif not SHARD_BY_BRANCH and os.path.exists(CAR_INDEX_CSV):
+        merge_shards()
+        print("Branch shards merged back into", CARS_CSV, "and", CARS_BOOKED_CSV)
+    elif SHARD_BY_BRANCH and (has_rows(CARS_CSV, CARS_COLS) or has_rows(CARS_BOOKED_CSV, CARS_BOOKED_COLS)):
+        print(f"Warning: {CARS_CSV} / {CARS_BOOKED_CSV} have rows but sharding is on; "
+              f"they are ignored (only {SHARDS_DIR}/ is used).")
+
+def split_into_shards():
+    """Split the global cars/bookings CSVs into branch shards and empty the global files."""
+    os.makedirs(SHARDS_DIR, exist_ok=True)
+    cdf = read_csv_safe(CARS_CSV, CARS_COLS)
+    bdf = read_csv_safe(CARS_BOOKED_CSV, CARS_BOOKED_COLS)
+    # Group on the normalised key so blank branches are kept (groupby drops NA keys)
+    car_branch = cdf["Branch"].map(branch_key)
+    for branch, part in cdf.groupby(car_branch):
+        save_df_safe(part, shard_path(branch, CARS_CSV), CARS_COLS)
+    # Active bookings follow their car; bookings for unknown cars go to Unassigned
+    branch_of = dict(zip(cdf["Car Name"].astype(str), car_branch))
+    booking_branch = bdf["Car Name"].astype(str).map(branch_of).fillna(UNASSIGNED_BRANCH)
+    for branch, part in bdf.groupby(booking_branch):
+        save_df_safe(part, shard_path(branch, CARS_BOOKED_CSV), CARS_BOOKED_COLS)
+    idx = cdf[CAR_INDEX_COLS].copy()
+    idx["Branch"] = car_branch
+    save_df_safe(idx, CAR_INDEX_CSV, CAR_INDEX_COLS)
+    # The shards now own this data; clear the globals so the two copies cannot drift
+    pd.DataFrame(columns=CARS_COLS).to_csv(CARS_CSV, index=False)
+    pd.DataFrame(columns=CARS_BOOKED_COLS).to_csv(CARS_BOOKED_CSV, index=False)
+
+def merge_shards():
+    """Merge every branch shard back into the global CSVs and remove the shard layout."""
+    for filename, cols in ((CARS_CSV, CARS_COLS), (CARS_BOOKED_CSV, CARS_BOOKED_COLS)):
+        # The shards own the data while sharded, so overwrite the global file from
+        # them alone; a re-run after an interrupted merge rewrites the same rows
+        save_df_safe(read_all_shards(filename, cols), filename, cols)
+    shutil.rmtree(SHARDS_DIR)
+
+# ----------------------------- Layout-aware paths -----------------------------
+def cars_path_for_branch(branch):
+    """Cars CSV that a car in the given branch is stored in."""
+    if not SHARD_BY_BRANCH:
+        return CARS_CSV
+    path = shard_path(branch, CARS_CSV)
+    ensure_csv(path, CARS_COLS)
+    return path
+
+def cars_path_for(carname=None, carno=None):
+    """Cars CSV holding the given car, or None if it is unknown in sharded mode."""
+    if not SHARD_BY_BRANCH:
+        return CARS_CSV
+    branch = lookup_branch(carname, carno)
+    if branch is None:
+        return None
+    return cars_path_for_branch(branch)
+
+def bookings_path_for(carname):
+    """Bookings CSV for the given car, or None if no shard holds bookings for it."""
+    if not SHARD_BY_BRANCH:
+        return CARS_BOOKED_CSV
+    branch = lookup_branch(carname)
+    if branch is not None:
+        path = shard_path(branch, CARS_BOOKED_CSV)
+        ensure_csv(path, CARS_BOOKED_COLS)
+        return path
+    # Car is no longer indexed (e.g. deleted) - find the shard still holding its bookings
+    for path in list_shard_paths(CARS_BOOKED_CSV):
+        bdf = read_csv_safe(path, CARS_BOOKED_COLS)
+        if (bdf["Car Name"].astype(str) == carname).any():
+            return path
+    return None
+
+def cars_version():
+    """Modification stamp of every cars file, used to invalidate cached results."""
+    paths = list_shard_paths(CARS_CSV) if SHARD_BY_BRANCH else [CARS_CSV]
+    stamps = []
+    for p in paths:
+        if os.path.exists(p):
+            st = os.stat(p)
+            stamps.append((p, st.st_mtime_ns, st.st_size))
+    return tuple(stamps)
+
+def read_cars():
+    """All cars, merged across branches when sharded."""
+    if SHARD_BY_BRANCH:
+        return read_all_shards(CARS_CSV, CARS_COLS)
+    return read_csv_safe(CARS_CSV, CARS_COLS)
+
+def read_bookings():
+    """All active bookings, merged across branches when sharded."""
+    if SHARD_BY_BRANCH:
+        return read_all_shards(CARS_BOOKED_CSV, CARS_BOOKED_COLS)
+    return read_csv_safe(CARS_BOOKED_CSV, CARS_BOOKED_COLS)